@@ -1,8 +1,11 @@
 from dataclasses import is_dataclass, Field
 from abc import abstractmethod, ABC
 from collections.abc import Iterator, Sequence, Mapping
+from itertools import accumulate
+from operator import attrgetter
 
 from typing import TypeVar, Generic, get_origin, get_args, Any, Callable, Optional
+import numpy as np
 import pyarrow as pa
 
 
@@ -16,6 +19,12 @@ AA = TypeVar('AA', bound=pa.Array)
 
 class ArrowMarshaller(Generic[T, AS, AA], ABC):
 
+    # True iff the whole marshaller subtree consists of basic types only (no
+    # dataclasses, whose instances PyArrow cannot consume directly), in which
+    # case conversions can be handed to PyArrow's native converters in one
+    # shot instead of looping per element in Python.
+    is_pure_basic: bool = False
+
     def __init__(self, py_type: type[T], arrow_dtype: pa.DataType):
         self.py_type = py_type
         self.arrow_dtype = arrow_dtype
@@ -36,6 +45,13 @@ class ArrowMarshaller(Generic[T, AS, AA], ABC):
     def from_arrow_array(self, arrow: AA) -> Sequence[T]:
         raise NotImplementedError
 
+    def from_arrow_array_boxed(self, arrow: AA) -> Sequence[T]:
+        # Like from_arrow_array, but guaranteed to yield plain Python values.
+        # Numeric marshallers decode batches to numpy views, which must not
+        # leak into reconstructed Python containers (dataclass fields, dict
+        # keys and values).
+        return self.from_arrow_array(arrow)
+
 
 class CustomArrowMarshaller(ArrowMarshaller[T, AS, AA]):
     def __init__(self, base: ArrowMarshaller[U, AS, AA], encoder: Callable[[T], U], decoder: Callable[[U], T]):
@@ -51,14 +67,19 @@ class CustomArrowMarshaller(ArrowMarshaller[T, AS, AA]):
         return self.decoder(self.base.from_arrow(arrow))
 
     def to_arrow_array(self, py: Sequence[T]) -> AA:
-        return self.base.to_arrow_array([self.encoder(x) for x in py])
+        return self.base.to_arrow_array(list(map(self.encoder, py)))
 
     def from_arrow_array(self, arrow: AA) -> Sequence[T]:
-        return [self.decoder(x) for x in self.base.from_arrow_array(arrow)]
+        return list(map(self.decoder, self.base.from_arrow_array(arrow)))
+
+    def from_arrow_array_boxed(self, arrow: AA) -> Sequence[T]:
+        return list(map(self.decoder, self.base.from_arrow_array_boxed(arrow)))
 
 
 class BasicTypeArrowMarshaller(ArrowMarshaller[T, AS, AA]):
 
+        is_pure_basic = True
+
         def __init__(self, py_type: type[T], arrow_type: pa.DataType):
             super().__init__(py_type, arrow_type)
 
@@ -69,24 +90,86 @@ class BasicTypeArrowMarshaller(ArrowMarshaller[T, AS, AA]):
             return arrow.as_py()
 
         def to_arrow_array(self, py: Sequence[T]) -> AA:
-            return pa.array(py, type=self.arrow_dtype)
+            return pa.array(py, type=self.arrow_dtype, from_pandas=False)
 
         def from_arrow_array(self, arrow: AA) -> Sequence[T]:
             return arrow.to_pylist()
 
+
+class NumericTypeArrowMarshaller(BasicTypeArrowMarshaller[T, AS, AA]):
+
+        def __init__(self, py_type: type[T], arrow_type: pa.DataType, np_dtype: np.dtype):
+            super().__init__(py_type, arrow_type)
+            self.np_dtype = np_dtype
+
+        def to_arrow_array(self, py: Sequence[T]) -> AA:
+            # pa.array adopts a numpy buffer of the matching dtype zero-copy;
+            # for plain Python sequences its own scanner is faster than a
+            # numpy detour, so only coerce the dtype when already an ndarray.
+            if isinstance(py, np.ndarray):
+                py = py.astype(self.np_dtype, copy=False)
+            return pa.array(py, type=self.arrow_dtype, from_pandas=False)
+
+        def from_arrow_array(self, arrow: AA) -> Sequence[T]:
+            # One contiguous buffer view (zero-copy when the array has no
+            # nulls) instead of N boxed Python numbers.
+            return arrow.to_numpy(zero_copy_only=False)
+
+        def from_arrow_array_boxed(self, arrow: AA) -> Sequence[T]:
+            return arrow.to_pylist()
+
+
+# Interned composite pa.DataType / pa.Field objects. Structurally equal Arrow
+# types compare equal but are distinct heap objects when built repeatedly;
+# interning dedups them and makes identity checks valid during dispatch.
+_dtype_cache: dict[Any, pa.DataType] = {}
+_field_cache: dict[tuple[str, pa.DataType], pa.Field] = {}
+
+
+def _list_dtype(elem: pa.DataType) -> pa.DataType:
+    key = ('list', elem)
+    dt = _dtype_cache.get(key)
+    if dt is None:
+        dt = _dtype_cache[key] = pa.list_(elem)
+    return dt
+
+
+def _map_dtype(key_dtype: pa.DataType, item_dtype: pa.DataType) -> pa.DataType:
+    key = ('map', key_dtype, item_dtype)
+    dt = _dtype_cache.get(key)
+    if dt is None:
+        dt = _dtype_cache[key] = pa.map_(key_dtype, item_dtype)
+    return dt
+
+
+def _struct_dtype(fields: tuple[pa.Field, ...]) -> pa.DataType:
+    key = ('struct', fields)
+    dt = _dtype_cache.get(key)
+    if dt is None:
+        dt = _dtype_cache[key] = pa.struct(list(fields))
+    return dt
+
+
+def _field(name: str, dtype: pa.DataType) -> pa.Field:
+    f = _field_cache.get((name, dtype))
+    if f is None:
+        f = _field_cache[(name, dtype)] = pa.field(name, dtype)
+    return f
+
+
 null = BasicTypeArrowMarshaller[type(None), pa.NullScalar, pa.NullArray](type(None), pa.null())
 boolean = BasicTypeArrowMarshaller[bool, pa.BooleanScalar, pa.BooleanArray](bool, pa.bool_())
-int8 = BasicTypeArrowMarshaller[int, pa.Int8Scalar, pa.Int8Array](int, pa.int8())
-int16 = BasicTypeArrowMarshaller[int, pa.Int16Scalar, pa.Int16Array](int, pa.int16())
-int32 = BasicTypeArrowMarshaller[int, pa.Int32Scalar, pa.Int32Array](int, pa.int32())
-int64 = BasicTypeArrowMarshaller[int, pa.Int64Scalar, pa.Int64Array](int, pa.int64())
-uint8 = BasicTypeArrowMarshaller[int, pa.UInt8Scalar, pa.UInt8Array](int, pa.uint8())
-uint16 = BasicTypeArrowMarshaller[int, pa.UInt16Scalar, pa.UInt16Array](int, pa.uint16())
-uint32 = BasicTypeArrowMarshaller[int, pa.UInt32Scalar, pa.UInt32Array](int, pa.uint32())
-uint64 = BasicTypeArrowMarshaller[int, pa.UInt64Scalar, pa.UInt64Array](int, pa.uint64())
-float16 = BasicTypeArrowMarshaller[float, pa.HalfFloatScalar, pa.HalfFloatArray](float, pa.float16())
-float32 = BasicTypeArrowMarshaller[float, pa.FloatScalar, pa.FloatArray](float, pa.float32())
-float64 = BasicTypeArrowMarshaller[float, pa.DoubleScalar, pa.DoubleArray](float, pa.float64())
+int8 = NumericTypeArrowMarshaller[int, pa.Int8Scalar, pa.Int8Array](int, pa.int8(), np.int8)
+int16 = NumericTypeArrowMarshaller[int, pa.Int16Scalar, pa.Int16Array](int, pa.int16(), np.int16)
+int32 = NumericTypeArrowMarshaller[int, pa.Int32Scalar, pa.Int32Array](int, pa.int32(), np.int32)
+int64 = NumericTypeArrowMarshaller[int, pa.Int64Scalar, pa.Int64Array](int, pa.int64(), np.int64)
+uint8 = NumericTypeArrowMarshaller[int, pa.UInt8Scalar, pa.UInt8Array](int, pa.uint8(), np.uint8)
+uint16 = NumericTypeArrowMarshaller[int, pa.UInt16Scalar, pa.UInt16Array](int, pa.uint16(), np.uint16)
+uint32 = NumericTypeArrowMarshaller[int, pa.UInt32Scalar, pa.UInt32Array](int, pa.uint32(), np.uint32)
+uint64 = NumericTypeArrowMarshaller[int, pa.UInt64Scalar, pa.UInt64Array](int, pa.uint64(), np.uint64)
+float16 = NumericTypeArrowMarshaller[float, pa.HalfFloatScalar, pa.HalfFloatArray](float, pa.float16(), np.float16)
+float32 = NumericTypeArrowMarshaller[float, pa.FloatScalar, pa.FloatArray](float, pa.float32(), np.float32)
+float64 = NumericTypeArrowMarshaller[float, pa.DoubleScalar, pa.DoubleArray](float, pa.float64(), np.float64)
 string = BasicTypeArrowMarshaller[str, pa.StringScalar, pa.StringArray](str, pa.string())
 binary = BasicTypeArrowMarshaller[bytes, pa.BinaryScalar, pa.BinaryArray](bytes, pa.binary())
 # TODO:
@@ -100,100 +183,202 @@ class ListArrowMarshaller(ArrowMarshaller[Sequence[T], pa.ListScalar, pa.ListArr
 
     def __init__(self, elem: ArrowMarshaller[T, AS, AA]):
         self.elem = elem
-        super().__init__(Sequence[T], pa.list_(elem.arrow_dtype))
+        self.is_pure_basic = elem.is_pure_basic
+        super().__init__(Sequence[T], _list_dtype(elem.arrow_dtype))
+        # Specialize once at construction: the basic/nested dispatch is
+        # decided per type, not re-checked on every call.
+        if self.is_pure_basic:
+            self.to_arrow = self._to_arrow_basic
+            self.from_arrow = self._from_arrow_basic
+            self.to_arrow_array = self._to_arrow_array_basic
+            self.from_arrow_array = self._from_arrow_array_basic
+
+    def _to_arrow_basic(self, py: Sequence[T]) -> pa.ListScalar:
+        return pa.scalar(py, type=self.arrow_dtype)
+
+    def _from_arrow_basic(self, arrow: pa.ListScalar) -> Sequence[T]:
+        return arrow.as_py()
+
+    def _to_arrow_array_basic(self, py: Sequence[Sequence[T]]) -> pa.ListArray:
+        return pa.array(py, type=self.arrow_dtype)
+
+    def _from_arrow_array_basic(self, arrow: pa.ListArray) -> Sequence[Sequence[T]]:
+        return arrow.to_pylist()
 
     def to_arrow(self, py: Sequence[T]) -> pa.ListScalar:
-        if isinstance(self.elem, BasicTypeArrowMarshaller):
-            s = pa.scalar(py, type=self.arrow_dtype)
-        else:
-            s = pa.scalar([self.elem.to_arrow(sub) for sub in py], type=self.arrow_dtype)
-        assert isinstance(s, pa.ListScalar)
-        return s
+        return pa.scalar([self.elem.to_arrow(sub) for sub in py], type=self.arrow_dtype)
 
     def from_arrow(self, arrow: pa.ListScalar) -> Sequence[T]:
-        if isinstance(self.elem, BasicTypeArrowMarshaller):
-            return arrow.as_py()
-        else:
-            return [self.elem.from_arrow(sub) for sub in arrow]
+        return [self.elem.from_arrow(sub) for sub in arrow]
 
     def to_arrow_array(self, py: Sequence[Sequence[T]]) -> pa.ListArray:
-        if isinstance(self.elem, BasicTypeArrowMarshaller):
-            a = pa.array(py, type=self.arrow_dtype)
-        else:
-            a = pa.array([self.to_arrow(sub) for sub in py], type=self.arrow_dtype)
-        assert isinstance(a, pa.ListArray)
-        return a
+        # Flatten all sublists into one child array plus an offsets buffer:
+        # one builder invocation for the whole batch instead of one scalar
+        # construction per row.
+        offsets = pa.array(accumulate((len(sub) for sub in py), initial=0), type=pa.int32())
+        values = self.elem.to_arrow_array([x for sub in py for x in sub])
+        return pa.ListArray.from_arrays(offsets, values, type=self.arrow_dtype)
 
     def from_arrow_array(self, arrow: pa.ListArray) -> Sequence[Sequence[T]]:
-        if isinstance(self.elem, BasicTypeArrowMarshaller):
-            return arrow.to_pylist()
-        return [self.from_arrow(sub) for sub in arrow]
+        return list(map(self.from_arrow, arrow))
 
 
 class MapArrowMarshaller(ArrowMarshaller[Mapping[K, V], pa.MapScalar, pa.MapArray]):
     def __init__(self, key: ArrowMarshaller[K, Any, Any], value: ArrowMarshaller[V, Any, Any]):
         self.key = key
         self.value = value
-        super().__init__(Mapping[K, V], pa.map_(self.key.arrow_dtype, self.value.arrow_dtype))
+        self.is_pure_basic = key.is_pure_basic and value.is_pure_basic
+        super().__init__(Mapping[K, V], _map_dtype(self.key.arrow_dtype, self.value.arrow_dtype))
+        # Specialize once at construction, as in ListArrowMarshaller.
+        if self.is_pure_basic:
+            self.to_arrow = self._to_arrow_basic
+            self.from_arrow = self._from_arrow_basic
+            self.to_arrow_array = self._to_arrow_array_basic
+            self.from_arrow_array = self._from_arrow_array_basic
+
+    def _to_arrow_basic(self, py: T) -> pa.MapScalar:
+        return pa.scalar(py, type=self.arrow_dtype)
+
+    def _from_arrow_basic(self, arrow: pa.MapScalar) -> T:
+        return dict(arrow.as_py())
+
+    def _to_arrow_array_basic(self, py: Sequence[Mapping[K, V]]) -> pa.MapArray:
+        return pa.array(py, type=self.arrow_dtype)
+
+    def _from_arrow_array_basic(self, arrow: pa.MapArray) -> Sequence[T]:
+        return [dict(sub) for sub in arrow.to_pylist()]
 
     def to_arrow(self, py: T) -> pa.MapScalar:
-        s = pa.scalar(py, type=self.arrow_dtype)
-        assert isinstance(s, pa.MapScalar)
-        return s
+        # pa.scalar cannot consume entries of non-basic Python types (e.g.
+        # dataclass instances), so go through the columnar batch builder.
+        return self.to_arrow_array([py])[0]
 
     def from_arrow(self, arrow: pa.MapScalar) -> T:
-        if isinstance(self.key, BasicTypeArrowMarshaller) and isinstance(self.value, BasicTypeArrowMarshaller):
-            return {
-                k: v for k, v in arrow
-            }
-        return {
-            self.key.from_arrow(arrow[i][0]): self.value.from_arrow(arrow[i][1])
-            for i in range(len(arrow))
-        }
+        # arrow.values is the underlying entries struct array; convert its
+        # keys and items children in batch instead of materializing one
+        # Arrow scalar per entry.
+        entries = arrow.values
+        return dict(zip(
+            self.key.from_arrow_array_boxed(entries.field(0)),
+            self.value.from_arrow_array_boxed(entries.field(1)),
+        ))
 
     def to_arrow_array(self, py: Sequence[Mapping[K, V]]) -> pa.MapArray:
-        if isinstance(self.key, BasicTypeArrowMarshaller) and isinstance(self.value, BasicTypeArrowMarshaller):
-            a = pa.array(py, type=self.arrow_dtype)
-        else:
-            a = pa.array([self.to_arrow(sub) for sub in py], type=self.arrow_dtype)
-        assert isinstance(a, pa.MapArray)
-        return a
+        # Flatten all entries into one keys array and one items array plus an
+        # offsets buffer, so each side is built by a single child call.
+        offsets = pa.array(accumulate((len(sub) for sub in py), initial=0), type=pa.int32())
+        keys = self.key.to_arrow_array([k for sub in py for k in sub.keys()])
+        items = self.value.to_arrow_array([v for sub in py for v in sub.values()])
+        return pa.MapArray.from_arrays(offsets, keys, items, type=self.arrow_dtype)
 
     def from_arrow_array(self, arrow: pa.MapArray) -> Sequence[T]:
-        return [self.from_arrow(sub) for sub in arrow]
+        # Convert the flattened keys and items child arrays once, then split
+        # them back into per-row dicts along the offsets.
+        offsets = arrow.offsets.to_pylist()
+        keys = self.key.from_arrow_array_boxed(arrow.keys)
+        items = self.value.from_arrow_array_boxed(arrow.items)
+        return [
+            dict(zip(keys[start:end], items[start:end]))
+            for start, end in zip(offsets, offsets[1:])
+        ]
 
 
 class StructArrowMarshaller(ArrowMarshaller[T, pa.StructScalar, pa.StructArray]):
     def __init__(self, cls: type[T]):
         assert is_dataclass(cls)
         self.cls = cls
-        self.fields = {
-            f.name: derive_arrow_marshaller_for_field(f)
+        # Field names and child marshallers live in parallel tuples so the
+        # hot paths walk them by index instead of hashing names.
+        self._field_names = tuple(cls.__dataclass_fields__)
+        self._field_marshallers = tuple(
+            derive_arrow_marshaller_for_field(f)
             for f in cls.__dataclass_fields__.values()
-        }
-        arrow_dtype = pa.struct([
-            (name, marshaller.arrow_dtype) for name, marshaller in self.fields.items()
-        ])
+        )
+        self._field_getters = tuple(attrgetter(name) for name in self._field_names)
+        # attrgetter over all field names yields a tuple in field order, which
+        # PyArrow converts to a struct without per-row name resolution.
+        # attrgetter needs at least one name and returns a bare value for
+        # exactly one, so both ends are special-cased.
+        if len(self._field_names) == 0:
+            self._row_getter = lambda obj: ()
+        elif len(self._field_names) == 1:
+            getter = self._field_getters[0]
+            self._row_getter = lambda obj: (getter(obj),)
+        else:
+            self._row_getter = attrgetter(*self._field_names)
+        arrow_dtype = _struct_dtype(tuple(
+            _field(name, marshaller.arrow_dtype)
+            for name, marshaller in zip(self._field_names, self._field_marshallers)
+        ))
+        self.schema = pa.schema(arrow_dtype)
         super().__init__(cls, arrow_dtype)
 
+    @property
+    def fields(self) -> dict[str, ArrowMarshaller]:
+        return dict(zip(self._field_names, self._field_marshallers))
+
     def to_arrow(self, py: T) -> pa.StructScalar:
-        a = pa.scalar(py.__dict__, type=self.arrow_dtype)
-        assert isinstance(a, pa.StructScalar)
-        return a
+        # A positional tuple avoids both the __dict__ access (which breaks
+        # for dataclasses with __slots__) and PyArrow's per-row field-name
+        # resolution.
+        return pa.scalar(self._row_getter(py), type=self.arrow_dtype)
 
     def from_arrow(self, arrow: pa.StructScalar) -> T:
-        return self.cls(**{
-            f: self.fields[f].from_arrow(v)
-            for f, v in arrow.items()
-        })
+        # Struct scalars preserve field order, so index positionally and call
+        # the generated __init__ with positional args: no per-row dict build,
+        # field-name hashing or kwargs expansion.
+        return self.cls(*[
+            m.from_arrow(arrow[i]) for i, m in enumerate(self._field_marshallers)
+        ])
+
+    def _column_arrays(self, py: Sequence[T]) -> list[pa.Array]:
+        # Build one Arrow array per field (SoA) instead of one struct scalar
+        # per row: a single native builder invocation per column.
+        return [
+            m.to_arrow_array(list(map(g, py)))
+            for g, m in zip(self._field_getters, self._field_marshallers)
+        ]
+
+    def _rows_from_columns(self, columns: list[Sequence[Any]], num_rows: int) -> Sequence[T]:
+        # map() drives the row loop in C, calling the generated __init__
+        # directly with one positional arg per column. With no columns map()
+        # has nothing to iterate, so the row count must come from the caller.
+        if not columns:
+            return [self.cls() for _ in range(num_rows)]
+        return list(map(self.cls, *columns))
 
     def to_arrow_array(self, py: Sequence[T]) -> pa.StructArray:
-        a = pa.array([self.to_arrow(sub) for sub in py], type=self.arrow_dtype)
-        assert isinstance(a, pa.StructArray)
-        return a
+        if not self._field_marshallers:
+            # StructArray.from_arrays cannot infer a length from zero child
+            # arrays; build the empty-struct rows directly.
+            return pa.array([()] * len(py), type=self.arrow_dtype)
+        return pa.StructArray.from_arrays(self._column_arrays(py), fields=list(self.arrow_dtype))
 
     def from_arrow_array(self, arrow: pa.StructArray) -> Sequence[T]:
-        return [self.from_arrow(sub) for sub in arrow]
+        return self._rows_from_columns([
+            m.from_arrow_array_boxed(arrow.field(i))
+            for i, m in enumerate(self._field_marshallers)
+        ], len(arrow))
+
+    # For serializing whole collections prefer these over to_arrow_array:
+    # record batches and tables go straight to the IPC/Parquet writers
+    # without an intermediate StructArray.
+    def to_record_batch(self, py: Sequence[T]) -> pa.RecordBatch:
+        if not self._field_marshallers:
+            # RecordBatch.from_arrays infers length 0 from zero child arrays,
+            # silently dropping the rows; go through the struct array, which
+            # carries an explicit length.
+            return pa.RecordBatch.from_struct_array(self.to_arrow_array(py))
+        return pa.RecordBatch.from_arrays(self._column_arrays(py), schema=self.schema)
+
+    def from_record_batch(self, batch: pa.RecordBatch) -> Sequence[T]:
+        return self._rows_from_columns([
+            m.from_arrow_array_boxed(batch.column(i))
+            for i, m in enumerate(self._field_marshallers)
+        ], batch.num_rows)
+
+    def to_table(self, py: Sequence[T]) -> pa.Table:
+        return pa.Table.from_batches([self.to_record_batch(py)], schema=self.schema)
 
 
 def derive_arrow_marshaller_for_field(f: Field) -> ArrowMarshaller:
@@ -207,39 +392,56 @@ def derive_arrow_marshaller_for_field(f: Field) -> ArrowMarshaller:
     return derive_arrow_marshaller(f.type)
 
 
+_marshaller_cache: dict[type, ArrowMarshaller] = {}
+
+
 def derive_arrow_marshaller(cls: type) -> ArrowMarshaller:
-    if cls is type(None):
-        return null
-    elif cls is bool:
-        return boolean
-    elif cls is int:
-        return int64
-    elif cls is float:
-        return float64
-    elif cls is str:
-        return string
-    elif cls is bytes:
-        return binary
-    elif is_dataclass(cls):
+    # Memoized: deriving a marshaller for a nested type walks the whole type
+    # tree, so each type (including generic aliases such as `list[int]`, which
+    # are hashable) is derived at most once.
+    m = _marshaller_cache.get(cls)
+    if m is None:
+        m = _derive_arrow_marshaller(cls)
+        _marshaller_cache[cls] = m
+    return m
+
+
+_PRIMITIVE_MARSHALLERS: dict[type, ArrowMarshaller] = {
+    type(None): null,
+    bool: boolean,
+    int: int64,
+    float: float64,
+    str: string,
+    bytes: binary,
+}
+
+
+def _derive_arrow_marshaller(cls: type) -> ArrowMarshaller:
+    m = _PRIMITIVE_MARSHALLERS.get(cls)
+    if m is not None:
+        return m
+    if is_dataclass(cls):
         return StructArrowMarshaller(cls)
-    elif get_origin(cls) is not None and issubclass(get_origin(cls), Sequence):
-        return ListArrowMarshaller(derive_arrow_marshaller(get_args(cls)[0]))
-    elif get_origin(cls) is not None and issubclass(get_origin(cls), Mapping):
-        return MapArrowMarshaller(derive_arrow_marshaller(get_args(cls)[0]), derive_arrow_marshaller(get_args(cls)[1]))
+    origin = get_origin(cls)
+    if origin is not None:
+        args = get_args(cls)
+        if issubclass(origin, Sequence):
+            return ListArrowMarshaller(derive_arrow_marshaller(args[0]))
+        elif issubclass(origin, Mapping):
+            return MapArrowMarshaller(derive_arrow_marshaller(args[0]), derive_arrow_marshaller(args[1]))
     raise NotImplementedError(f"Cannot derive ArrowMarshaller for {cls}")
 
 
 def read_parquet(f: str, cls: type[T]) -> Iterator[T]:
     import pyarrow.parquet as pq
     marshaller = derive_arrow_marshaller(cls)
-    schema = pa.schema(marshaller.arrow_dtype)
+    assert isinstance(marshaller, StructArrowMarshaller)
     table = pq.read_table(f)
-    assert table.schema == schema
+    assert table.schema == marshaller.schema
     reader: pa.RecordBatchReader = table.to_reader()
     for batch in reader:
         assert isinstance(batch, pa.RecordBatch)
-        batch_array = batch.to_struct_array()
-        yield from marshaller.from_arrow_array(batch_array)
+        yield from marshaller.from_record_batch(batch)
 
 
 class DataClassArrowMixin:
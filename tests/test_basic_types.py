@@ -12,6 +12,8 @@ class Person:
     gender: bool
 
 
+person = st.builds(Person, name=st.text(), age=st.integers(0, 128), gender=st.booleans())
+
 strategies = {
     "int8": st.integers(-2**7, 2**7 - 1),
     "int16": st.integers(-2**15, 2**15 - 1),
@@ -20,7 +22,9 @@ strategies = {
     "string": st.text(),
     "list[int64]": st.lists(st.integers(-2**63, 2**63 - 1)),
     "map[string, int64]": st.dictionaries(st.text(), st.integers(-2**63, 2**63 - 1)),
-    "Person": st.builds(Person, name=st.text(), age=st.integers(0, 128), gender=st.booleans())
+    "Person": person,
+    "list[Person]": st.lists(person),
+    "map[string, Person]": st.dictionaries(st.text(), person)
 }
 
 marshallers = {
@@ -31,12 +35,16 @@ marshallers = {
     "string": fa.string,
     "list[int64]": fa.derive_arrow_marshaller(list[int]),
     "map[string, int64]": fa.derive_arrow_marshaller(dict[str, int]),
-    "Person": fa.derive_arrow_marshaller(Person)
+    "Person": fa.derive_arrow_marshaller(Person),
+    "list[Person]": fa.derive_arrow_marshaller(list[Person]),
+    "map[string, Person]": fa.derive_arrow_marshaller(dict[str, Person])
 }
 
 
+# The inner @given loops count toward the outer deadline, and the
+# container-of-dataclass types run per-element scalar paths.
 @given(t=st.sampled_from(list(marshallers.keys())))
-@settings(max_examples=128, deadline=timedelta(milliseconds=2000))
+@settings(max_examples=128, deadline=timedelta(milliseconds=5000))
 def test_type(t):
     print(f"Testing for type {t}")
     marshaller = marshallers[t]
@@ -51,8 +59,63 @@ def test_type(t):
     def test_list(x):
         a = marshaller.to_arrow_array(x)
         assert a.type == marshaller.arrow_dtype
-        assert marshaller.from_arrow_array(a) == x
+        # numeric marshallers return numpy-backed arrays, so compare elementwise
+        assert list(marshaller.from_arrow_array(a)) == x
 
     test_elem()
     test_list()
 
+
+@dataclass
+class Empty:
+    pass
+
+
+def test_zero_field_dataclass():
+    marshaller = fa.derive_arrow_marshaller(Empty)
+    x = [Empty(), Empty(), Empty()]
+    assert marshaller.from_arrow(marshaller.to_arrow(Empty())) == Empty()
+    a = marshaller.to_arrow_array(x)
+    assert len(a) == len(x)
+    assert list(marshaller.from_arrow_array(a)) == x
+    batch = marshaller.to_record_batch(x)
+    assert batch.num_rows == len(x)
+    assert marshaller.from_record_batch(batch) == x
+    assert marshaller.to_table(x).num_rows == len(x)
+
+
+def test_struct_decode_boxes_scalars():
+    # Numeric columns decode to numpy views, but values landing in
+    # reconstructed dataclass fields must be plain Python scalars.
+    marshaller = marshallers["Person"]
+    people = [Person("a", 3, True)]
+    from_array = marshaller.from_arrow_array(marshaller.to_arrow_array(people))
+    from_batch = marshaller.from_record_batch(marshaller.to_record_batch(people))
+    for p in (from_array[0], from_batch[0]):
+        assert type(p.name) is str
+        assert type(p.age) is int
+        assert type(p.gender) is bool
+
+
+def test_empty_nested():
+    # Zero-row batches and empty collections exercise the offsets-only edge
+    # of the flatten/offsets builders.
+    for t, empty in [("list[Person]", []), ("map[string, Person]", {})]:
+        marshaller = marshallers[t]
+        a = marshaller.to_arrow_array([])
+        assert a.type == marshaller.arrow_dtype
+        assert list(marshaller.from_arrow_array(a)) == []
+        s = marshaller.to_arrow(empty)
+        assert marshaller.from_arrow(s) == empty
+
+
+@given(x=st.lists(strategies["Person"]))
+@settings(deadline=timedelta(milliseconds=2000))
+def test_record_batch(x):
+    marshaller = marshallers["Person"]
+    batch = marshaller.to_record_batch(x)
+    assert batch.schema == marshaller.schema
+    assert marshaller.from_record_batch(batch) == x
+    table = marshaller.to_table(x)
+    assert table.schema == marshaller.schema
+